@@ -3,6 +3,7 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
+from rate_limit import limiter
 import logging
 
 # Configure logging
@@ -16,7 +17,12 @@ db = SQLAlchemy(model_class=Base)
 # Create the app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1) # needed for url_for to generate with https
+# Needed for url_for to generate with https and for the real client IP used
+# by rate limiting. Replit serves the app behind a single proxy, so one
+# X-Forwarded-For hop is trusted by default; set TRUSTED_PROXY_HOPS to 0 when
+# running without a proxy, or so forged headers would dodge the IP limits.
+trusted_proxy_hops = int(os.environ.get("TRUSTED_PROXY_HOPS", "1"))
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxy_hops, x_proto=1, x_host=1)
 
 # Configure the database
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
@@ -25,8 +31,13 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_pre_ping": True,
 }
 
+# Configure rate limiting; set RATELIMIT_STORE to a shared store to share
+# limits between instances
+app.config["RATELIMIT_ENABLED"] = os.environ.get("RATELIMIT_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+
 # Initialize the app with the extension
 db.init_app(app)
+limiter.init_app(app)
 
 with app.app_context():
     # Make sure to import the models here or their tables won't be created
@@ -0,0 +1,152 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from functools import wraps
+
+from flask import request, session, make_response, render_template
+
+
+# Allow ``limit`` requests every ``per`` seconds for each value returned by
+# ``key_func``, with bursts of up to ``burst`` (defaults to ``limit``).
+RateLimit = namedtuple("RateLimit", ["key_func", "limit", "per", "burst"], defaults=[None])
+
+
+class BaseRateLimitStore(ABC):
+    """Holds token-bucket state. Subclass this to share buckets between
+    worker processes or instances (e.g. a Redis-backed store)."""
+
+    @abstractmethod
+    def consume(self, buckets):
+        """Take one token from each of ``buckets``, a list of
+        ``(key, rate, capacity)`` tuples, all or nothing.
+
+        Must be atomic: if any bucket is empty, no tokens are taken. Returns
+        the number of seconds until every bucket has a token again, or 0 when
+        the tokens were taken.
+        """
+
+
+class MemoryRateLimitStore(BaseRateLimitStore):
+    """In-process store. Fine for a single worker or local development;
+    each gunicorn worker keeps its own buckets."""
+
+    def __init__(self, sweep_every=1000):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    def consume(self, buckets):
+        now = time.monotonic()
+        with self._lock:
+            self._calls += 1
+            if self._calls >= self._sweep_every:
+                self._calls = 0
+                self._sweep(now)
+
+            refilled = []
+            retry_after = 0
+            for key, rate, capacity in buckets:
+                tokens, last, _ = self._buckets.get(key, (capacity, now, None))
+                tokens = min(capacity, tokens + (now - last) * rate)
+                refilled.append((key, rate, capacity, tokens))
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+
+            taken = 0 if retry_after else 1
+            for key, rate, capacity, tokens in refilled:
+                tokens -= taken
+                # A bucket idle this long is full again and can be dropped.
+                full_at = now + (capacity - tokens) / rate
+                self._buckets[key] = (tokens, now, full_at)
+            return retry_after
+
+    def _sweep(self, now):
+        stale = [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]
+        for key in stale:
+            del self._buckets[key]
+
+
+class RateLimiter:
+    """Configured from ``app.config`` by ``init_app``:
+
+    - ``RATELIMIT_ENABLED``: set to False to turn limiting off (default True).
+    - ``RATELIMIT_STORE``: a ``BaseRateLimitStore`` instance shared by every
+      limit (default ``MemoryRateLimitStore()``).
+    """
+
+    def __init__(self):
+        self.store = MemoryRateLimitStore()
+        self.enabled = True
+
+    def init_app(self, app):
+        app.config.setdefault("RATELIMIT_ENABLED", True)
+        app.config.setdefault("RATELIMIT_STORE", None)
+        self.enabled = app.config["RATELIMIT_ENABLED"]
+        self.store = app.config["RATELIMIT_STORE"] or MemoryRateLimitStore()
+
+    def check(self, scope, limits):
+        """Take a token for every key of ``limits``; returns seconds to wait,
+        or 0. Nothing is taken when any key is over its limit."""
+        buckets = []
+        for rule in limits:
+            key = rule.key_func()
+            if key:
+                buckets.append((f"{scope}:{key}", rule.limit / rule.per, rule.burst or rule.limit))
+        if not buckets:
+            return 0
+        return self.store.consume(buckets)
+
+
+limiter = RateLimiter()
+
+
+def client_ip_key():
+    return f"ip:{request.remote_addr or 'unknown'}"
+
+
+def user_id_key():
+    # Read the id Flask-Login keeps in the session rather than current_user,
+    # which would load the user from the database.
+    user_id = session.get("_user_id")
+    return f"user:{user_id}" if user_id else None
+
+
+def browser_session_key():
+    browser_session_key = session.get("_browser_session_key")
+    return f"session:{browser_session_key}" if browser_session_key else None
+
+
+def too_many_requests(retry_after):
+    retry_after = max(1, math.ceil(retry_after))
+    response = make_response(render_template("429.html", retry_after=retry_after), 429)
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+def enforce_rate_limit(scope, *limits):
+    """Check ``limits`` for the current request; returns a 429 response when
+    one has been exceeded, otherwise None."""
+    if not limiter.enabled:
+        return None
+    retry_after = limiter.check(scope, limits)
+    if retry_after:
+        return too_many_requests(retry_after)
+    return None
+
+
+def rate_limit(scope, *limits):
+    """Apply one or more ``RateLimit`` rules to a view. Place it above
+    ``require_login`` so abusive traffic is rejected before the view's queries
+    run; only the 429 page itself loads the current user for the navbar."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            rejected = enforce_rate_limit(scope, *limits)
+            if rejected is not None:
+                return rejected
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
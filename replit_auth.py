@@ -18,6 +18,7 @@ from werkzeug.local import LocalProxy
 
 from app import app, db
 from models import OAuth, User
+from rate_limit import RateLimit, browser_session_key, client_ip_key, enforce_rate_limit
 
 login_manager = LoginManager(app)
 
@@ -103,6 +104,20 @@ def make_replit_blueprint():
         g.browser_session_key = session['_browser_session_key']
         g.flask_dance_replit = replit_bp.session
 
+    @replit_bp.before_request
+    def throttle_auth_requests():
+        # Only the endpoint that starts a login flow. A 429 on the OAuth
+        # callback would discard the one-time authorization code, and logout
+        # must always work so sessions on shared machines can be ended.
+        if request.endpoint != "replit_auth.login":
+            return None
+        # Callers here are usually not logged in yet, so key on the browser
+        # session, with a much looser IP limit because many real users can
+        # share one address (carrier NAT, offices).
+        return enforce_rate_limit("auth",
+                                  RateLimit(browser_session_key, limit=10, per=60, burst=20),
+                                  RateLimit(client_ip_key, limit=120, per=60, burst=240))
+
     @replit_bp.route("/logout")
     def logout():
         del replit_bp.token
@@ -6,6 +6,7 @@ from datetime import datetime
 from app import app, db
 from replit_auth import require_login, make_replit_blueprint
 from models import Giveaway, Entry
+from rate_limit import RateLimit, rate_limit, user_id_key, client_ip_key
 
 app.register_blueprint(make_replit_blueprint(), url_prefix="/auth")
 
@@ -59,6 +60,10 @@ def giveaway_detail(giveaway_id):
                          user_entry=user_entry)
 
 @app.route('/giveaway/<int:giveaway_id>/enter', methods=['POST'])
+@rate_limit("enter_giveaway",
+            RateLimit(user_id_key, limit=5, per=60, burst=10),
+            # Many real users can share one address (carrier NAT, offices).
+            RateLimit(client_ip_key, limit=120, per=60, burst=240))
 @require_login
 def enter_giveaway(giveaway_id):
     giveaway = Giveaway.query.get_or_404(giveaway_id)